@@ -0,0 +1,317 @@
+"""Lightweight JSON API over the sunburst data.
+
+Serves the same hierarchy, state summaries and top-colleges lists that final_app.py shows,
+using only the standard library (asyncio) on top of sunburst_core.
+
+Endpoints (all GET/HEAD, all return JSON):
+    /states                                       - available states
+    /hierarchy?state=<state>                      - filtered sunburst rows for a state
+    /summary?state=<state>                        - summary metrics for a state (from the rollup cube)
+    /top-colleges?state=<state>&min_registrations=<n>
+
+Every response is built once per dataset version (the lead files' and state lookup's size/mtime)
+and kept alongside its gzip form and ETag, so a client polling with If-None-Match gets a 304 without
+any pandas work. Each request only stats the files; rebuilds run on a worker thread; if the new files fail to load (e.g. a half-written
+daily overwrite) the last good version keeps being served, or 503 until one has loaded.
+
+Run with:
+    python api_server.py --host 127.0.0.1 --port 8502
+    python api_server.py --state-lookup data/college_state_master.csv
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+from collections import namedtuple
+from urllib.parse import parse_qs, urlsplit
+
+import sunburst_core
+
+# Thresholds offered by the app's "Filter by Registration Count" dropdown are precomputed
+DEFAULT_THRESHOLDS = (50, 100)
+
+# Top-colleges responses for other thresholds are cached too, up to this many per dataset version
+MAX_EXTRA_RESPONSES = 256
+
+CachedResponse = namedtuple("CachedResponse", ["body", "gzip_body", "etag"])
+_Build = namedtuple("_Build", ["version", "responses", "extra_responses", "cube", "states"])
+
+
+def _records(df):
+    """Convert a dataframe to JSON-safe records (NaN becomes null)"""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def _make_response(payload, version):
+    """Serialize a payload once and keep its gzip body and ETag next to it"""
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    etag = f'"{version}-{hashlib.sha1(body).hexdigest()[:16]}"'
+    return CachedResponse(body, gzip.compress(body, mtime=0), etag)
+
+
+def _top_colleges_response(cube, state, threshold, version):
+    top_colleges = sunburst_core.top_colleges_from_cube(cube, state, min_registrations=threshold)
+    return _make_response({
+        "version": version,
+        "state": state,
+        "min_registrations": threshold,
+        "colleges": _records(top_colleges),
+    }, version)
+
+
+class ResponseCache:
+    """Precomputed API responses for one pair of lead files, rebuilt when the files change
+
+    A build that fails (missing or half-written files) is recorded in last_error and the last good
+    build keeps being served; that version is not retried until the files change again.
+    """
+
+    def __init__(self, ai_path=sunburst_core.AI_LEADS_PATH, tech_path=sunburst_core.TECH_LEADS_PATH,
+                 state_lookup_path=sunburst_core.STATE_LOOKUP_PATH):
+        self.ai_path = ai_path
+        self.tech_path = tech_path
+        self.state_lookup_path = state_lookup_path
+        self.last_error = None
+        self._built = None  # swapped as a whole so readers never see half of a rebuild
+        self._failed_version = None
+        self._refresh_lock = asyncio.Lock()
+
+    @property
+    def version(self):
+        return self._built.version if self._built else None
+
+    def _changed_version(self):
+        """The files' current version if it still needs building, else None (only stats the files)"""
+        try:
+            version = sunburst_core.dataset_version(self.ai_path, self.tech_path, self.state_lookup_path)
+        except OSError as e:
+            self.last_error = f"CSV file not found: {e}"
+            return None
+        return None if version in (self.version, self._failed_version) else version
+
+    def refresh(self):
+        """Rebuild every response if the lead files have changed since the last build"""
+        version = self._changed_version()
+        if version is None:
+            return
+
+        try:
+            self._built = self._build(version)
+        except Exception as e:
+            self._failed_version = version
+            self.last_error = f"Could not load dataset {version}: {e!r}"
+            return
+        self._failed_version = None
+        self.last_error = None
+
+    async def refresh_async(self):
+        """refresh() on a worker thread when the files changed; while it runs, requests keep the current build"""
+        if self._changed_version() is None:
+            return
+        if self._refresh_lock.locked() and self._built is not None:
+            return
+        async with self._refresh_lock:
+            await asyncio.to_thread(self.refresh)
+
+    def _build(self, version):
+        sunburst_df, ai_df, tech_df = sunburst_core.load_and_process_data(self.ai_path, self.tech_path,
+                                                                          self.state_lookup_path)
+        states = sunburst_core.get_available_states(sunburst_df)
+        cube = sunburst_core.build_rollup_cube(sunburst_df, ai_df, tech_df)
+
+        responses = {("/states", None, None): _make_response({"version": version, "states": states}, version)}
+        for state in ["All States"] + states:
+            hierarchy = sunburst_core.filter_data_by_state(sunburst_df, state)
+            responses[("/hierarchy", state, None)] = _make_response(
+                {"version": version, "state": state, "rows": _records(hierarchy)}, version)
+            responses[("/summary", state, None)] = _make_response(
+                dict(sunburst_core.state_summary(cube, state), version=version), version)
+            for threshold in DEFAULT_THRESHOLDS:
+                responses[("/top-colleges", state, threshold)] = _top_colleges_response(
+                    cube, state, threshold, version)
+
+        return _Build(version, responses, {}, cube, set(states))
+
+    def get(self, path, state, threshold):
+        """Return the cached response for a request, or None if the route/state is unknown"""
+        built = self._built
+        if built is None:
+            return None
+        key = (path, state, threshold)
+        response = built.responses.get(key) or built.extra_responses.get(key)
+        if response is not None:
+            return response
+
+        # Thresholds outside the defaults are built on first request and cached for this version
+        if path == "/top-colleges" and (state == "All States" or state in built.states):
+            response = _top_colleges_response(built.cube, state, threshold, built.version)
+            if len(built.extra_responses) < MAX_EXTRA_RESPONSES:
+                built.extra_responses[key] = response
+            return response
+
+        return None
+
+
+def _etag_matches(if_none_match, etag):
+    """Check an If-None-Match header value against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _accepts_gzip(accept_encoding):
+    """True if the Accept-Encoding header allows gzip"""
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _parse_query(path, query):
+    """Translate a request's query string into the (state, threshold) cache key parts"""
+    params = parse_qs(query)
+    state = params.get("state", ["All States"])[0] if path != "/states" else None
+
+    threshold = None
+    if path == "/top-colleges":
+        raw = params.get("min_registrations", ["100"])[0]
+        try:
+            threshold = int(raw)
+        except ValueError:
+            raise ValueError(f"min_registrations must be an integer, got {raw!r}")
+    return state, threshold
+
+
+def _build_reply(status, reason, headers, body=b""):
+    lines = [f"HTTP/1.1 {status} {reason}"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+def _error_reply(status, reason, message, keep_alive):
+    body = json.dumps({"error": message}).encode("utf-8")
+    return _build_reply(status, reason, {
+        "Content-Type": "application/json",
+        "Content-Length": str(len(body)),
+        "Connection": "keep-alive" if keep_alive else "close",
+    }, body)
+
+
+def handle_request(cache, method, target, headers):
+    """Produce the raw HTTP reply bytes for one parsed request (the cache is refreshed by the caller)"""
+    keep_alive = headers.get("connection", "").lower() != "close"
+
+    if method not in ("GET", "HEAD"):
+        return _error_reply(405, "Method Not Allowed", f"Method {method} not allowed", keep_alive)
+
+    url = urlsplit(target)
+    path = url.path.rstrip("/") or "/"
+    try:
+        state, threshold = _parse_query(path, url.query)
+    except ValueError as e:
+        return _error_reply(400, "Bad Request", str(e), keep_alive)
+
+    if cache.version is None:
+        return _error_reply(503, "Service Unavailable", cache.last_error or "Dataset not loaded yet", keep_alive)
+
+    response = cache.get(path, state, threshold)
+    if response is None:
+        return _error_reply(404, "Not Found", f"No data for {path} (state={state!r})", keep_alive)
+
+    base_headers = {
+        "ETag": response.etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+        "Connection": "keep-alive" if keep_alive else "close",
+    }
+    if _etag_matches(headers.get("if-none-match"), response.etag):
+        return _build_reply(304, "Not Modified", base_headers)
+
+    body = response.body
+    base_headers["Content-Type"] = "application/json"
+    if _accepts_gzip(headers.get("accept-encoding")):
+        body = response.gzip_body
+        base_headers["Content-Encoding"] = "gzip"
+    base_headers["Content-Length"] = str(len(body))
+
+    return _build_reply(200, "OK", base_headers, b"" if method == "HEAD" else body)
+
+
+async def _serve_connection(cache, reader, writer):
+    """Serve requests on one connection until the client closes it or asks to"""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            try:
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            except ValueError:
+                writer.write(_error_reply(400, "Bad Request", "Malformed request line", False))
+                break
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            # Request bodies are not used by any endpoint; drain them so keep-alive stays in sync
+            raw_length = headers.get("content-length", "0") or "0"
+            if not raw_length.isdigit():
+                writer.write(_error_reply(400, "Bad Request", f"Invalid Content-Length {raw_length!r}", False))
+                break
+            if int(raw_length):
+                await reader.readexactly(int(raw_length))
+
+            await cache.refresh_async()
+            try:
+                reply = handle_request(cache, method.upper(), target, headers)
+            except Exception as e:
+                writer.write(_error_reply(500, "Internal Server Error", repr(e), False))
+                break
+            writer.write(reply)
+            await writer.drain()
+
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host, port, ai_path, tech_path, state_lookup_path=sunburst_core.STATE_LOOKUP_PATH):
+    cache = ResponseCache(ai_path, tech_path, state_lookup_path)
+    await cache.refresh_async()
+    if cache.last_error:
+        print(f"Dataset not loaded, answering 503 until it is: {cache.last_error}")
+
+    server = await asyncio.start_server(lambda r, w: _serve_connection(cache, r, w), host, port)
+    print(f"Serving sunburst API for dataset {cache.version} on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON API for the AI Program sunburst data")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--ai-leads", default=sunburst_core.AI_LEADS_PATH, help="AI Intern lead file")
+    parser.add_argument("--tech-leads", default=sunburst_core.TECH_LEADS_PATH, help="Tech Lead lead file")
+    parser.add_argument("--state-lookup", default=sunburst_core.STATE_LOOKUP_PATH, help="college -> state master lookup")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.ai_leads, args.tech_leads, args.state_lookup))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
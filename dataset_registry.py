@@ -0,0 +1,168 @@
+"""Registry of lead-file datasets (one per program / cohort) with lazy loading and LRU eviction.
+
+Datasets are listed in datasets.json:
+
+    {
+        "memory_budget_mb": 512,
+        "datasets": {
+            "AI Program": {"ai_leads": "aieLeads.csv", "tech_leads": "TechLeads.csv"},
+            "Cohort 2": {"ai_leads": "data/cohort2/aieLeads.csv", "tech_leads": "data/cohort2/TechLeads.csv",
+                         "snapshots": "data/cohort2/snapshots", "state_lookup": "data/cohort2/college_state_master.csv"}
+        }
+    }
+
+"snapshots" defaults to snapshots/ for "AI Program" (the same store it uses without a config file, so
+adding one keeps the recorded history) and to snapshots/<name> for every other dataset; "state_lookup"
+defaults to the shared college_state_master.csv. Without a config file the registry serves the single
+default pair of lead files.
+
+A dataset is read and processed (hierarchy + rollup cube) on first access and kept in memory
+while it fits the budget; the least recently used datasets are dropped first and simply
+reloaded from their CSV files or snapshot store the next time they are selected.
+"""
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+import sunburst_core
+from snapshot_store import SNAPSHOT_DIR, SnapshotStore
+
+DATASETS_CONFIG = "datasets.json"
+DEFAULT_DATASET = "AI Program"
+DEFAULT_MEMORY_BUDGET_MB = 512
+
+DatasetSource = namedtuple("DatasetSource", ["name", "ai_leads", "tech_leads", "snapshots", "state_lookup"])
+LoadedDataset = namedtuple("LoadedDataset", ["sunburst_df", "ai_df", "tech_df", "cube", "version", "nbytes"])
+
+
+def estimate_nbytes(obj):
+    """Approximate in-memory size of a loaded dataset (dataframes, arrays and the containers holding them)"""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(obj, pd.DataFrame) else usage)
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_nbytes(key) + estimate_nbytes(value) for key, value in obj.items())
+    if isinstance(obj, (list, tuple, set)):
+        return sys.getsizeof(obj) + sum(estimate_nbytes(item) for item in obj)
+    return sys.getsizeof(obj)
+
+
+def read_config(config_path=DATASETS_CONFIG):
+    """Return (sources by name, memory budget in bytes) from the datasets config file"""
+    if not os.path.exists(config_path):
+        default = DatasetSource(DEFAULT_DATASET, sunburst_core.AI_LEADS_PATH, sunburst_core.TECH_LEADS_PATH, SNAPSHOT_DIR,
+                                sunburst_core.STATE_LOOKUP_PATH)
+        return {DEFAULT_DATASET: default}, DEFAULT_MEMORY_BUDGET_MB * 1024 * 1024
+
+    with open(config_path, encoding="utf-8") as f:
+        config = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(config_path))
+    sources = {}
+    for name, entry in config["datasets"].items():
+        try:
+            ai_leads, tech_leads = entry["ai_leads"], entry["tech_leads"]
+        except KeyError as e:
+            raise ValueError(f"Dataset {name!r} in {config_path} is missing {e}")
+        snapshots = entry.get("snapshots", SNAPSHOT_DIR if name == DEFAULT_DATASET else os.path.join(SNAPSHOT_DIR, name))
+        state_lookup = entry.get("state_lookup", sunburst_core.STATE_LOOKUP_PATH)
+        sources[name] = DatasetSource(
+            name, *(os.path.join(base_dir, path) for path in (ai_leads, tech_leads, snapshots, state_lookup)))
+    return sources, int(config.get("memory_budget_mb", DEFAULT_MEMORY_BUDGET_MB) * 1024 * 1024)
+
+
+class DatasetRegistry:
+    """Lazily loaded datasets kept in an LRU under a total memory budget
+
+    Entries are keyed by (dataset, as_of, since): the live CSV files when as_of is None, a snapshot
+    as of a date, or the growth between two snapshots. Safe to share between Streamlit sessions.
+    """
+
+    def __init__(self, config_path=DATASETS_CONFIG):
+        self.sources, self.memory_budget = read_config(config_path)
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._snapshot_stores = {}
+
+    def names(self):
+        return list(self.sources)
+
+    def snapshot_store(self, name):
+        """The dataset's snapshot store (it only caches the manifest, so keeping it costs no budget)"""
+        with self._lock:
+            if name not in self._snapshot_stores:
+                self._snapshot_stores[name] = SnapshotStore(self.sources[name].snapshots)
+            return self._snapshot_stores[name]
+
+    @property
+    def memory_used(self):
+        return sum(dataset.nbytes for dataset in self._loaded.values())
+
+    def _version(self, key):
+        name, as_of, since = key
+        source = self.sources[name]
+        if as_of is None:
+            return sunburst_core.dataset_version(source.ai_leads, source.tech_leads, source.state_lookup)
+        # Snapshots never change once recorded
+        return f"snapshot:{as_of}:{since}"
+
+    def _load(self, key, version):
+        name, as_of, since = key
+        source = self.sources[name]
+        if as_of is None:
+            frames = sunburst_core.load_and_process_data(source.ai_leads, source.tech_leads, source.state_lookup)
+        elif since is None:
+            frames = self.snapshot_store(name).hierarchy_as_of(as_of)
+        else:
+            frames = self.snapshot_store(name).delta_hierarchy(since, as_of)
+
+        cube = sunburst_core.build_rollup_cube(*frames)
+        return LoadedDataset(*frames, cube, version, estimate_nbytes(frames) + estimate_nbytes(cube))
+
+    def get(self, name, as_of=None, since=None):
+        """Return the LoadedDataset for a dataset (optionally a snapshot or growth view), loading it if needed"""
+        if name not in self.sources:
+            raise KeyError(f"Unknown dataset {name!r}; available: {', '.join(self.sources)}")
+        key = (name, as_of, since)
+        version = self._version(key)
+
+        with self._lock:
+            dataset = self._loaded.get(key)
+            if dataset is not None and dataset.version == version:
+                self._loaded.move_to_end(key)
+                return dataset
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so other datasets stay available; one loader per key
+        with load_lock:
+            with self._lock:
+                dataset = self._loaded.get(key)
+            if dataset is None or dataset.version != version:
+                dataset = self._load(key, version)
+
+            with self._lock:
+                self._loaded[key] = dataset
+                self._loaded.move_to_end(key)
+                self._evict()
+        return dataset
+
+    def _evict(self):
+        """Drop least recently used datasets until the budget is met (the most recent one always stays)"""
+        while self.memory_used > self.memory_budget and len(self._loaded) > 1:
+            oldest = next(iter(self._loaded))
+            # Its load lock stays: another thread may be about to reload this key, and dropping the lock
+            # would let a third caller load it at the same time
+            del self._loaded[oldest]
+
+    def loaded(self):
+        """(key, nbytes) of resident datasets, least recently used first"""
+        with self._lock:
+            return [(key, dataset.nbytes) for key, dataset in self._loaded.items()]
@@ -1,173 +1,19 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 
+from dataset_registry import DATASETS_CONFIG, DatasetRegistry
+from sunburst_core import filter_data_by_state, get_available_states, top_colleges_from_cube
+
 # Set page configuration
 st.set_page_config(page_title="AI Program Structure", layout="wide")
 
 # Title
 st.title("AI Program Structure - Interactive Sunburst Chart")
 
-@st.cache_data
-def load_and_process_data():
-    # Load your CSV files - update these paths to match your server file locations
-    ai_df = pd.read_csv("aieLeads.csv")  # Make sure this file is in your Streamlit app directory
-    tech_df = pd.read_csv("TechLeads.csv")  # Make sure this file is in your Streamlit app directory
-    
-    # Tag each level
-    ai_df["Level"] = "AI Intern"
-    tech_df["Level"] = "Tech Lead"
-
-    # Prepare labels without trailing spaces for consistency
-    tech_df["Label"] = tech_df["CollegeName"] + " (Tech Lead)"
-    ai_df["Label"] = ai_df["CollegeName"] + " (Intern)"
-
-    # Store State information for hover - handle missing State column gracefully
-    if "State" in tech_df.columns:
-        tech_df["StateInfo"] = tech_df["State"]
-    else:
-        tech_df["StateInfo"] = "N/A"
-    
-    if "State" in ai_df.columns:
-        ai_df["StateInfo"] = ai_df["State"]
-    else:
-        ai_df["StateInfo"] = "N/A"
-
-    # Assign Parent for tech leads (children of AI Coach 1)
-    tech_df["Parent"] = "AI Coach 1"
-
-    # Map AI Intern's Parent to Tech Lead's Label exactly
-    ai_df["Parent"] = ai_df["CollegeName"].map(dict(zip(tech_df["CollegeName"], tech_df["Label"])))
-
-    # Handle unmatched AI Interns by assigning them to a default "Tech Lead (Unassigned)"
-    ai_df["Parent"].fillna("Tech Lead (Unassigned)", inplace=True)
-
-    # Create intermediate nodes with default TotalRegistrations
-    coaches = pd.DataFrame({
-        "Label": ["AI Coach 1"],
-        "Parent": ["Cohort Owner 1"],
-        "TotalRegistrations": [200],  # default value
-        "Level": ["AI Coach"],
-        "StateInfo": ["N/A"]  # No state for intermediate nodes
-    })
-
-    cohorts = pd.DataFrame({
-        "Label": ["Cohort Owner 1"],
-        "Parent": ["Program Lead"],
-        "TotalRegistrations": [20],  # default value
-        "Level": ["Cohort Owner"],
-        "StateInfo": ["N/A"]  # No state for intermediate nodes
-    })
-
-    program = pd.DataFrame({
-        "Label": ["Program Lead"],
-        "Parent": [""],
-        "TotalRegistrations": [1],  # default value
-        "Level": ["Program Lead"],
-        "StateInfo": ["N/A"]  # No state for intermediate nodes
-    })
-
-    # Add missing "Tech Lead (Unassigned)" node
-    unassigned = pd.DataFrame({
-        "Label": ["Tech Lead (Unassigned)"],
-        "Parent": ["AI Coach 1"],
-        "TotalRegistrations": [0],
-        "Level": ["Tech Lead"],
-        "StateInfo": ["N/A"]  # No state for unassigned
-    })
-
-    # Combine all dataframes
-    sunburst_df = pd.concat([
-        program[["Label", "Parent", "TotalRegistrations", "Level", "StateInfo"]],
-        cohorts[["Label", "Parent", "TotalRegistrations", "Level", "StateInfo"]],
-        coaches[["Label", "Parent", "TotalRegistrations", "Level", "StateInfo"]],
-        tech_df[["Label", "Parent", "TotalRegistrations", "Level", "StateInfo"]],
-        ai_df[["Label", "Parent", "TotalRegistrations", "Level", "StateInfo"]],
-        unassigned[["Label", "Parent", "TotalRegistrations", "Level", "StateInfo"]],
-    ], ignore_index=True)
-
-    # Ensure TotalRegistrations is numeric
-    sunburst_df["TotalRegistrations"] = pd.to_numeric(sunburst_df["TotalRegistrations"], errors="coerce").fillna(0)
-    
-    return sunburst_df, ai_df, tech_df
-
-def get_top_colleges_by_registrations(ai_df, tech_df, selected_state=None, min_registrations=100):
-    """Get colleges with registrations >= min_registrations, optionally filtered by state"""
-    # Combine data from both dataframes and sum registrations by college
-    all_colleges = []
-    
-    # Add tech leads
-    for _, row in tech_df.iterrows():
-        college_data = {
-            'CollegeName': row['CollegeName'],
-            'TotalRegistrations': row['TotalRegistrations'],
-            'StateInfo': row.get('StateInfo', 'N/A')
-        }
-        all_colleges.append(college_data)
-    
-    # Add AI interns
-    for _, row in ai_df.iterrows():
-        college_data = {
-            'CollegeName': row['CollegeName'],
-            'TotalRegistrations': row['TotalRegistrations'],
-            'StateInfo': row.get('StateInfo', 'N/A')
-        }
-        all_colleges.append(college_data)
-    
-    colleges_df = pd.DataFrame(all_colleges)
-    
-    # Filter by state if specified
-    if selected_state and selected_state != "All States":
-        colleges_df = colleges_df[colleges_df['StateInfo'] == selected_state]
-    
-    # Group by college name and sum registrations
-    college_totals = colleges_df.groupby(['CollegeName', 'StateInfo'])['TotalRegistrations'].sum().reset_index()
-    
-    # Filter colleges with registrations >= minimum threshold
-    filtered_colleges = college_totals[college_totals['TotalRegistrations'] >= min_registrations]
-    
-    # Sort by total registrations (descending)
-    top_colleges = filtered_colleges.sort_values('TotalRegistrations', ascending=False)
-    
-    return top_colleges
-
-def filter_data_by_state(sunburst_df, selected_state):
-    """Filter the sunburst data for a specific state"""
-    if selected_state == "All States":
-        return sunburst_df
-    
-    # Filter only the records that belong to the selected state (Tech Leads and AI Interns)
-    state_filtered = sunburst_df[
-        (sunburst_df["StateInfo"] == selected_state) | 
-        (sunburst_df["StateInfo"] == "N/A")  # Keep intermediate nodes
-    ].copy()
-    
-    # If no data for the selected state, return empty dataframe with structure
-    if len(state_filtered[state_filtered["StateInfo"] == selected_state]) == 0:
-        return pd.DataFrame(columns=sunburst_df.columns)
-    
-    # Get the colleges in the selected state
-    state_colleges = sunburst_df[sunburst_df["StateInfo"] == selected_state]["Label"].tolist()
-    
-    # Filter to include only relevant Tech Leads and AI Interns
-    # Keep intermediate nodes and only the colleges from selected state
-    filtered_df = sunburst_df[
-        (sunburst_df["Level"].isin(["Program Lead", "Cohort Owner", "AI Coach"])) |  # Keep all intermediate nodes
-        (sunburst_df["StateInfo"] == selected_state) |  # Keep state-specific nodes
-        ((sunburst_df["Level"] == "Tech Lead") & (sunburst_df["StateInfo"] == "N/A") & (sunburst_df["Label"] == "Tech Lead (Unassigned)"))  # Keep unassigned if needed
-    ].copy()
-    
-    # Remove unassigned tech lead if no AI interns are unassigned in this state
-    unassigned_interns = sunburst_df[
-        (sunburst_df["Level"] == "AI Intern") & 
-        (sunburst_df["Parent"] == "Tech Lead (Unassigned)") & 
-        (sunburst_df["StateInfo"] == selected_state)
-    ]
-    
-    if len(unassigned_interns) == 0:
-        filtered_df = filtered_df[filtered_df["Label"] != "Tech Lead (Unassigned)"]
-    
-    return filtered_df
+@st.cache_resource
+def get_dataset_registry():
+    """Datasets from datasets.json, loaded lazily and shared read-only across sessions"""
+    return DatasetRegistry()
 
 def create_sunburst_chart(sunburst_df, selected_state="All States", selected_college=None):
     """Create sunburst chart with optional state filtering and college highlighting"""
@@ -193,6 +39,7 @@ def create_sunburst_chart(sunburst_df, selected_state="All States", selected_col
 
     # Ensure all segments have minimum value to be visible
     sunburst_df_display = sunburst_df.copy()
+    sunburst_df_display["TotalRegistrations"] = sunburst_df_display["TotalRegistrations"].astype(float)
     sunburst_df_display.loc[sunburst_df_display["TotalRegistrations"] == 0, "TotalRegistrations"] = 0.1
 
     # Create color mapping with highlighting for selected college
@@ -200,8 +47,8 @@ def create_sunburst_chart(sunburst_df, selected_state="All States", selected_col
         # Create a custom color column for highlighting
         sunburst_df_display['ColorCategory'] = sunburst_df_display['Level'].copy()
         
-        # Highlight selected college entries
-        selected_mask = sunburst_df_display["Label"].str.contains(selected_college, na=False, regex=False)
+        # Highlight selected college entries by exact label, so the chart matches the metric tiles
+        selected_mask = sunburst_df_display["Label"].isin([f"{selected_college} (Tech Lead)", f"{selected_college} (Intern)"])
         sunburst_df_display.loc[selected_mask, 'ColorCategory'] = 'Selected College'
         
         color_map = {
@@ -224,6 +71,15 @@ def create_sunburst_chart(sunburst_df, selected_state="All States", selected_col
         }
         color_column = 'Level'
         chart_title = f"AI Program Structure - {selected_state}" if selected_state != "All States" else "AI Program Structure - All States"
+
+    # Growth views flag colleges that are new since the comparison snapshot
+    if "NewCollege" in sunburst_df_display.columns and sunburst_df_display["NewCollege"].any():
+        if color_column == 'Level':
+            sunburst_df_display['ColorCategory'] = sunburst_df_display['Level'].copy()
+            color_column = 'ColorCategory'
+        new_mask = sunburst_df_display["NewCollege"].astype(bool) & (sunburst_df_display['ColorCategory'] != 'Selected College')
+        sunburst_df_display.loc[new_mask, 'ColorCategory'] = 'New College'
+        color_map = {**color_map, "New College": "#8E24AA"}  # Purple for new colleges
     
     fig = px.sunburst(
         sunburst_df_display,
@@ -256,14 +112,56 @@ def create_sunburst_chart(sunburst_df, selected_state="All States", selected_col
 
 # Main app
 try:
+    registry = get_dataset_registry()
+    
+    # Program selection - only shown when datasets.json lists more than one dataset
+    dataset_names = registry.names()
+    dataset_name = dataset_names[0]
+    if len(dataset_names) > 1:
+        with st.sidebar:
+            st.header("Program")
+            dataset_name = st.selectbox(
+                "Select a program:",
+                options=dataset_names,
+                index=0,
+                help="Each program has its own pair of lead files"
+            )
+    
+    # Snapshot selection - only shown once snapshots have been recorded with snapshot_store.py
+    as_of = since = None
+    snapshot_dates = registry.snapshot_store(dataset_name).dates()
+    if snapshot_dates:
+        with st.sidebar:
+            st.header("Snapshots")
+            as_of_option = st.selectbox(
+                "View data as of:",
+                options=["Latest CSV files"] + snapshot_dates[::-1],
+                index=0,
+                help="Show the program structure as recorded on an earlier date"
+            )
+            if as_of_option != "Latest CSV files":
+                as_of = as_of_option
+                since_option = st.selectbox(
+                    "Show growth since:",
+                    options=["(no comparison)"] + [date for date in snapshot_dates[::-1] if date < as_of],
+                    index=0,
+                    help="Size the chart by registrations gained between the two dates"
+                )
+                if since_option != "(no comparison)":
+                    since = since_option
+    
     # Load and process data
-    sunburst_df, ai_df, tech_df = load_and_process_data()
+    dataset = registry.get(dataset_name, as_of, since)
+    sunburst_df, cube = dataset.sunburst_df, dataset.cube
+    
+    if since:
+        new_colleges = sunburst_df.loc[sunburst_df["NewCollege"], "Label"].str.rsplit(" (", n=1).str[0].nunique()
+        st.info(f"Showing registration growth from {since} to {as_of} ({new_colleges} new colleges highlighted in purple)")
+    elif as_of:
+        st.info(f"Showing snapshot as of {as_of}")
     
     # Get unique states for dropdown (excluding N/A and intermediate nodes)
-    available_states = sorted(sunburst_df[
-        (sunburst_df["StateInfo"] != "N/A") & 
-        (sunburst_df["StateInfo"].notna())
-    ]["StateInfo"].unique())
+    available_states = get_available_states(sunburst_df)
     
     # Create three columns for filters
     col1, col2, col3 = st.columns(3)
@@ -290,14 +188,15 @@ try:
     with col3:
         st.subheader("Top Colleges by Registrations")
         # Get top colleges based on selected state and registration threshold
-        top_colleges = get_top_colleges_by_registrations(ai_df, tech_df, selected_state, min_registrations=registration_threshold)
+        top_colleges = top_colleges_from_cube(cube, selected_state, min_registrations=registration_threshold)
         
         if not top_colleges.empty:
-            # Create display options for dropdown
-            college_options = ["All Colleges"] + [
-                f"{row['CollegeName']} ({row['StateInfo']}) - {int(row['TotalRegistrations'])} registrations"
-                for _, row in top_colleges.iterrows()
-            ]
+            # Create display options for dropdown, remembering which college each option stands for
+            college_names = {
+                f"{name} ({state}) - {int(registrations)} registrations": name
+                for name, state, registrations in zip(top_colleges["CollegeName"], top_colleges["StateInfo"], top_colleges["TotalRegistrations"])
+            }
+            college_options = ["All Colleges"] + list(college_names)
             
             selected_college_option = st.selectbox(
                 f"Select from colleges with {registration_threshold}+ registrations ({len(top_colleges)} found):",
@@ -307,9 +206,7 @@ try:
             )
             
             # Extract college name if a specific college is selected
-            selected_college = None
-            if selected_college_option != "All Colleges":
-                selected_college = selected_college_option.split(" (")[0]
+            selected_college = college_names.get(selected_college_option)
         else:
             selected_college = None
             st.info(f"No colleges found for {selected_state}")
@@ -323,43 +220,34 @@ try:
     # Store selected college for highlighting but don't filter the dataframe
     # We'll handle college selection in the chart creation function
     
-    # Display summary statistics
+    # Display summary statistics (read from the rollup cube)
     if selected_state != "All States" or selected_college:
-        state_data = sunburst_df[sunburst_df["StateInfo"] == selected_state] if selected_state != "All States" else sunburst_df
-        
         if selected_college:
-            college_data = state_data[state_data["Label"].str.contains(selected_college, na=False, regex=False)]
+            stats = cube["colleges"].get((selected_state, selected_college))
             display_title = f"Statistics for {selected_college}"
         else:
-            college_data = state_data
+            stats = cube["states"].get(selected_state)
             display_title = f"Statistics for {selected_state}"
         
-        if not college_data.empty:
+        if stats:
             st.subheader(display_title)
             col1, col2, col3 = st.columns(3)
             
             with col1:
                 if selected_college:
-                    total_registrations = college_data["TotalRegistrations"].sum()
-                    st.metric("Total Registrations", int(total_registrations))
+                    st.metric("Total Registrations", stats["total_registrations"])
                 else:
-                    total_colleges = len(state_data[state_data["Level"].isin(["Tech Lead", "AI Intern"])]["Label"].str.replace(" \(.*\)", "", regex=True).unique())
-                    st.metric("Colleges in State", total_colleges)
+                    st.metric("Colleges in State", stats["colleges"])
             
             with col2:
                 if selected_college:
-                    tech_leads = len(college_data[college_data["Level"] == "Tech Lead"])
-                    ai_interns = len(college_data[college_data["Level"] == "AI Intern"])
-                    st.metric("Tech Leads / AI Interns", f"{tech_leads} / {ai_interns}")
+                    st.metric("Tech Leads / AI Interns", f"{stats['tech_leads']} / {stats['ai_interns']}")
                 else:
-                    total_registrations = state_data["TotalRegistrations"].sum()
-                    st.metric("Total Registrations", int(total_registrations))
+                    st.metric("Total Registrations", stats["total_registrations"])
             
             with col3:
                 if not selected_college:
-                    tech_leads = len(state_data[state_data["Level"] == "Tech Lead"])
-                    ai_interns = len(state_data[state_data["Level"] == "AI Intern"])
-                    st.metric("Tech Leads / AI Interns", f"{tech_leads} / {ai_interns}")
+                    st.metric("Tech Leads / AI Interns", f"{stats['tech_leads']} / {stats['ai_interns']}")
     
     # Create and display the chart
     fig = create_sunburst_chart(filtered_df, selected_state, selected_college)
@@ -388,11 +276,12 @@ try:
             st.dataframe(styled_df, use_container_width=True, hide_index=True)
             
             # Add legend with better formatting
-            st.markdown("""
+            buckets = cube["buckets"].get(selected_state, {})
+            st.markdown(f"""
             **Color Legend:**
-            - 🟢 **Green**: 100+ registrations
-            - 🟡 **Yellow**: 50-99 registrations
-            - 🔴 **Red**: Less than 50 registrations
+            - 🟢 **Green**: 100+ registrations ({buckets.get("100+", 0)} colleges in {selected_state})
+            - 🟡 **Yellow**: 50-99 registrations ({buckets.get("50-99", 0)} colleges in {selected_state})
+            - 🔴 **Red**: Less than 50 registrations ({buckets.get("<50", 0)} colleges in {selected_state})
             """)
             
             # Add download button for the filtered data
@@ -411,7 +300,7 @@ try:
             
             with col1:
                 st.subheader(f"Total Registrations by Level - {selected_state}")
-                summary = filtered_df.groupby("Level")["TotalRegistrations"].sum().reset_index()
+                summary = cube["level_totals"][selected_state]
                 st.dataframe(summary, use_container_width=True)
             
             with col2:
@@ -432,7 +321,7 @@ try:
 
 except FileNotFoundError as e:
     st.error(f"CSV file not found: {e}")
-    st.info("Please ensure your CSV files ('aieLeads.csv' and 'TechLeads.csv') are in the same directory as this Streamlit app.")
+    st.info(f"Please ensure {e.filename or 'the lead file'} exists, or point {DATASETS_CONFIG} at the right lead files.")
     
 except Exception as e:
     st.error(f"An error occurred: {e}")
@@ -459,6 +348,13 @@ with st.sidebar:
     5. Explore the color-coded colleges table
     6. Download filtered data as CSV
     
+    **Programs:**
+    - List each program's lead files in `datasets.json` to switch between them in the sidebar
+    
+    **Snapshots:**
+    - Run `python snapshot_store.py ingest` after each data refresh
+    - Pick a date in the sidebar to view an earlier snapshot or the growth since another snapshot
+    
     **Required CSV Files:**
     - aieLeads.csv - AI Intern data
     - TechLeads.csv - Tech Lead data
@@ -466,7 +362,7 @@ with st.sidebar:
     **Required Columns:**
     - CollegeName - Name of the college
     - TotalRegistrations - Number of registrations
-    - State - State where the college is located
+    - State - State where the college is located (missing or "-" states are filled from college_state_master.csv when it exists; rebuild it with `python state_lookup.py`)
     
     **Chart Interaction:**
     - Click on segments to drill down
@@ -0,0 +1,271 @@
+"""Concurrent-session load test for final_app.py.
+
+Drives the app headlessly with Streamlit's in-process AppTest against synthetic lead files.
+Every simulated session walks the usual widget sequence (state -> threshold -> college) and
+each rerun is timed; the report gives per-rerun p50/p95/p99 latency, reruns per second and
+peak RSS.
+
+    python load_test.py --sessions 50 --iterations 3
+    python load_test.py --compare HEAD~1 HEAD          # same load against two git revisions
+
+Revisions are exported with `git archive` and each one runs in its own subprocess so module
+caches, Streamlit caches and peak RSS do not leak between them.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+APP_SCRIPT = "final_app.py"
+
+SYNTHETIC_STATES = [
+    "Andhra Pradesh", "Telangana", "Tamil Nadu", "Karnataka", "Maharashtra", "Uttar Pradesh",
+    "Kerala", "West Bengal", "Gujarat", "Odisha", "Rajasthan", "Punjab", "Delhi", "-",
+]
+
+# Widget labels as they appear in final_app.py (matched by prefix so older revisions still work)
+STATE_LABEL = "Select a state"
+THRESHOLD_LABEL = "Select minimum registrations"
+COLLEGE_LABEL = "Select from colleges"
+
+
+def write_synthetic_leads(data_dir, n_colleges=3000, tech_lead_share=0.05, seed=0):
+    """Write aieLeads.csv / TechLeads.csv with a realistic skew of states and registrations"""
+    rng = np.random.default_rng(seed)
+    names = np.array([f"SYN{i:05d} - SYNTHETIC INSTITUTE OF TECHNOLOGY {i}" for i in range(n_colleges)])
+
+    # A few states hold most colleges, as in the real lead files
+    weights = 1.0 / np.arange(1, len(SYNTHETIC_STATES) + 1)
+    states = rng.choice(SYNTHETIC_STATES, size=n_colleges, p=weights / weights.sum())
+    registrations = np.maximum(1, rng.lognormal(mean=1.0, sigma=1.6, size=n_colleges).astype(int))
+
+    ai_df = pd.DataFrame({"CollegeName": names, "TotalRegistrations": registrations, "State": states})
+    tech_rows = rng.choice(n_colleges, size=max(1, int(n_colleges * tech_lead_share)), replace=False)
+    tech_df = pd.DataFrame({
+        "CollegeName": names[tech_rows],
+        "TotalRegistrations": np.maximum(1, registrations[tech_rows] // 10),
+        "State": states[tech_rows],
+    })
+
+    ai_df.to_csv(os.path.join(data_dir, "aieLeads.csv"), index=False)
+    tech_df.to_csv(os.path.join(data_dir, "TechLeads.csv"), index=False)
+
+
+def _selectbox(at, label_prefix):
+    for box in at.selectbox:
+        if box.label.startswith(label_prefix):
+            return box
+    return None
+
+
+def _failed(at):
+    return bool(at.exception) or len(at.error) > 0
+
+
+def run_session(app_path, seed, iterations, timeout):
+    """One simulated coordinator; returns [(step, seconds, failed)] for every rerun
+
+    A rerun that raises (AppTest raises RuntimeError when a run times out) is recorded as failed
+    and ends the session, since the app state after it is unknown.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    at = AppTest.from_file(app_path, default_timeout=timeout)
+    timings = []
+
+    def timed(step, action):
+        """Run one rerun; returns False if it raised"""
+        start = time.perf_counter()
+        try:
+            action()
+        except Exception:
+            timings.append((step, time.perf_counter() - start, True))
+            return False
+        timings.append((step, time.perf_counter() - start, _failed(at)))
+        return True
+
+    if not timed("initial", at.run):
+        return timings
+    for _ in range(iterations):
+        state_box = _selectbox(at, STATE_LABEL)
+        if state_box is not None:
+            state = rng.choice(state_box.options)
+            if not timed("state", lambda: state_box.set_value(state).run()):
+                break
+
+        threshold_box = _selectbox(at, THRESHOLD_LABEL)
+        if threshold_box is not None:
+            threshold = rng.choice(threshold_box.options)
+            if not timed("threshold", lambda: threshold_box.set_value(threshold).run()):
+                break
+
+        college_box = _selectbox(at, COLLEGE_LABEL)
+        if college_box is not None and len(college_box.options) > 1:
+            college = rng.choice(college_box.options[1:])
+            if not timed("college", lambda: college_box.set_value(college).run()):
+                break
+    return timings
+
+
+def _percentiles(seconds):
+    if not seconds:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(np.array(seconds) * 1000, [50, 95, 99])
+    return {"count": len(seconds), "p50_ms": round(p50, 1), "p95_ms": round(p95, 1), "p99_ms": round(p99, 1)}
+
+
+def _peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux but in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_load_test(app_dir, sessions=50, iterations=3, n_colleges=3000, seed=0, timeout=120):
+    """Run the load test against the app in app_dir and return a summary dict"""
+    app_path = os.path.join(os.path.abspath(app_dir), APP_SCRIPT)
+    original_cwd, original_path = os.getcwd(), list(sys.path)
+    sys.path.insert(0, os.path.dirname(app_path))
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="sunburst-load-") as data_dir:
+            write_synthetic_leads(data_dir, n_colleges=n_colleges, seed=seed)
+            # The app reads its lead files relative to the working directory
+            os.chdir(data_dir)
+
+            cold = run_session(app_path, seed, 0, timeout)[0]
+
+            barrier = threading.Barrier(sessions)
+
+            def session(i):
+                barrier.wait()
+                return run_session(app_path, seed + i + 1, iterations, timeout)
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=sessions) as pool:
+                results = list(pool.map(session, range(sessions)))
+            wall = time.perf_counter() - start
+            # Leave the temporary directory before it is removed
+            os.chdir(original_cwd)
+    finally:
+        os.chdir(original_cwd)
+        sys.path[:] = original_path
+
+    timings = [timing for result in results for timing in result]
+    by_step = {}
+    for step, seconds, _ in timings:
+        by_step.setdefault(step, []).append(seconds)
+
+    return {
+        "sessions": sessions,
+        "iterations": iterations,
+        "colleges": n_colleges,
+        "cold_start_ms": round(cold[1] * 1000, 1),
+        "cold_start_failed": cold[2],
+        "reruns": len(timings),
+        # A broken app often fails fast, so a failed cold start counts too
+        "failed_reruns": sum(failed for _, _, failed in timings) + cold[2],
+        "wall_s": round(wall, 2),
+        "reruns_per_s": round(len(timings) / wall, 2),
+        "peak_rss_mb": _peak_rss_mb(),
+        "latency": _percentiles([seconds for _, seconds, _ in timings]),
+        "latency_by_step": {step: _percentiles(seconds) for step, seconds in by_step.items()},
+    }
+
+
+def format_report(summary, title="Load test"):
+    lines = [
+        f"{title}: {summary['sessions']} sessions x {summary['iterations']} iterations, {summary['colleges']} synthetic colleges",
+        f"  cold start      {summary['cold_start_ms']} ms{' (failed)' if summary['cold_start_failed'] else ''}",
+        f"  reruns          {summary['reruns']} ({summary['failed_reruns']} failed) in {summary['wall_s']} s",
+        f"  throughput      {summary['reruns_per_s']} reruns/s",
+        f"  peak RSS        {summary['peak_rss_mb']} MB",
+        f"  {'step':<10} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}",
+    ]
+    for step, stats in [("all", summary["latency"])] + list(summary["latency_by_step"].items()):
+        if stats["count"]:
+            lines.append(f"  {step:<10} {stats['count']:>6} {stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}")
+    return "\n".join(lines)
+
+
+def format_comparison(revisions, summaries):
+    """Side-by-side table of two runs with the relative change of the second against the first"""
+    (base_rev, base), (head_rev, head) = zip(revisions, summaries)
+    rows = [
+        ("cold start ms", base["cold_start_ms"], head["cold_start_ms"]),
+        ("p50 ms", base["latency"]["p50_ms"], head["latency"]["p50_ms"]),
+        ("p95 ms", base["latency"]["p95_ms"], head["latency"]["p95_ms"]),
+        ("p99 ms", base["latency"]["p99_ms"], head["latency"]["p99_ms"]),
+        ("reruns/s", base["reruns_per_s"], head["reruns_per_s"]),
+        ("peak RSS MB", base["peak_rss_mb"], head["peak_rss_mb"]),
+        ("failed reruns", base["failed_reruns"], head["failed_reruns"]),
+    ]
+    lines = [f"{'metric':<15} {base_rev:>14} {head_rev:>14} {'change':>9}"]
+    for name, before, after in rows:
+        change = f"{(after - before) / before * 100:+.1f}%" if before else "-"
+        lines.append(f"{name:<15} {before:>14} {after:>14} {change:>9}")
+    return "\n".join(lines)
+
+
+def export_revision(revision, target_dir):
+    """Extract the tracked files of a git revision into target_dir"""
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    archive = subprocess.run(["git", "archive", revision], cwd=repo_dir, check=True, capture_output=True).stdout
+    subprocess.run(["tar", "-x", "-C", target_dir], input=archive, check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the Streamlit app")
+    parser.add_argument("--sessions", type=int, default=50, help="concurrent simulated sessions")
+    parser.add_argument("--iterations", type=int, default=3, help="state -> threshold -> college sequences per session")
+    parser.add_argument("--colleges", type=int, default=3000, help="synthetic colleges in the lead files")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per rerun")
+    parser.add_argument("--app-dir", default=os.path.dirname(os.path.abspath(__file__)), help="directory containing final_app.py")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE_REV", "HEAD_REV"), help="run the same load against two git revisions")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    if not args.compare:
+        summary = run_load_test(args.app_dir, args.sessions, args.iterations, args.colleges, args.seed, args.timeout)
+        print(json.dumps(summary) if args.json else format_report(summary))
+        return
+
+    summaries = []
+    for revision in args.compare:
+        with tempfile.TemporaryDirectory(prefix="sunburst-rev-") as app_dir:
+            export_revision(revision, app_dir)
+            result = subprocess.run([
+                sys.executable, os.path.abspath(__file__), "--json",
+                "--app-dir", app_dir,
+                "--sessions", str(args.sessions),
+                "--iterations", str(args.iterations),
+                "--colleges", str(args.colleges),
+                "--seed", str(args.seed),
+                "--timeout", str(args.timeout),
+            ], capture_output=True, text=True)
+        if result.returncode != 0:
+            sys.exit(f"Load test for revision {revision} failed:\n{result.stderr[-4000:]}")
+        summary = json.loads(result.stdout.strip().splitlines()[-1])
+        summaries.append(summary)
+        print(format_report(summary, title=f"Revision {revision}"))
+        print()
+
+    if args.json:
+        print(json.dumps(dict(zip(args.compare, summaries))))
+    else:
+        print(format_comparison(args.compare, summaries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""Append-only registration snapshots for the lead files.
+
+Each ingest records per-(college, state, level) registration totals as a compressed columnar
+segment (numpy .npz) holding only the rows that changed since the previous snapshot, plus
+tombstones for rows that disappeared. Every CHECKPOINT_EVERY snapshots a full segment is written
+so "as of" reconstruction only replays a bounded number of deltas.
+
+Layout of the store directory:
+    manifest.jsonl            - one line per snapshot, in date order (never rewritten), including
+                                the state lookup (path and content hash) applied at ingest
+    segment-<date>.npz        - columns: CollegeName, StateInfo, Level, TotalRegistrations, Removed
+
+Record today's files after the daily refresh with:
+    python snapshot_store.py ingest
+    python snapshot_store.py ingest --date 2026-10-19 --ai-leads aieLeads.csv --tech-leads TechLeads.csv
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import sunburst_core
+
+SNAPSHOT_DIR = "snapshots"
+MANIFEST_NAME = "manifest.jsonl"
+
+# A full segment is written every this many snapshots to bound the replay length
+CHECKPOINT_EVERY = 30
+
+KEY_COLUMNS = ["CollegeName", "StateInfo", "Level"]
+SNAPSHOT_COLUMNS = KEY_COLUMNS + ["TotalRegistrations"]
+
+
+def lead_totals(ai_df, tech_df):
+    """Per-(college, state, level) registration totals from the two lead frames"""
+    frames = []
+    for df, level in ((tech_df, "Tech Lead"), (ai_df, "AI Intern")):
+        state = df["State"] if "State" in df.columns else "N/A"
+        frames.append(pd.DataFrame({
+            "CollegeName": df["CollegeName"],
+            "StateInfo": state,
+            "Level": level,
+            "TotalRegistrations": pd.to_numeric(df["TotalRegistrations"], errors="coerce").fillna(0),
+        }))
+    totals = pd.concat(frames, ignore_index=True)
+    # Keys are stored as plain strings in the segments; "" stands in for a missing name/state
+    totals[["CollegeName", "StateInfo"]] = totals[["CollegeName", "StateInfo"]].fillna("").astype(str)
+    totals = totals.groupby(KEY_COLUMNS, sort=False)["TotalRegistrations"].sum().reset_index()
+    totals["TotalRegistrations"] = totals["TotalRegistrations"].astype("int64")
+    return totals
+
+
+def college_totals(totals):
+    """Totals per (college, level) with state as an attribute, taken from the college's largest row
+
+    The state of a row depends on the lookup applied at ingest, so it is not part of a college's identity.
+    """
+    totals = totals.sort_values("TotalRegistrations", ascending=False, kind="stable")
+    return totals.groupby(["CollegeName", "Level"], sort=False).agg(
+        StateInfo=("StateInfo", "first"),
+        TotalRegistrations=("TotalRegistrations", "sum"),
+    ).reset_index()
+
+
+def lookup_fingerprint(state_lookup_path):
+    """Manifest record of the state lookup used for an ingest (None when there is none)"""
+    if not state_lookup_path or not os.path.exists(state_lookup_path):
+        return None
+    with open(state_lookup_path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()[:16]
+    return {"path": state_lookup_path, "sha1": digest}
+
+
+def lead_frames(totals):
+    """Turn snapshot totals back into (ai_df, tech_df) shaped like the lead CSVs"""
+    frames = []
+    for level in ("AI Intern", "Tech Lead"):
+        rows = totals[totals["Level"] == level]
+        frames.append(pd.DataFrame({
+            "CollegeName": rows["CollegeName"].replace("", np.nan).to_numpy(),
+            "TotalRegistrations": rows["TotalRegistrations"].to_numpy(),
+            "State": rows["StateInfo"].replace("", np.nan).to_numpy(),
+        }))
+    return frames[0], frames[1]
+
+
+class SnapshotStore:
+    """Append-only store of registration snapshots, one per date"""
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = root
+        self._manifest_cache = None
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.root, MANIFEST_NAME)
+
+    def manifest(self):
+        """Snapshot entries in date order"""
+        if not os.path.exists(self.manifest_path):
+            return []
+        stat = os.stat(self.manifest_path)
+        if self._manifest_cache is None or self._manifest_cache[0] != (stat.st_size, stat.st_mtime_ns):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+            self._manifest_cache = ((stat.st_size, stat.st_mtime_ns), entries)
+        return self._manifest_cache[1]
+
+    def dates(self):
+        """Dates of all recorded snapshots, oldest first"""
+        return [entry["date"] for entry in self.manifest()]
+
+    def _read_segment(self, name):
+        # Not cached: a replay reads at most CHECKPOINT_EVERY small segments, and the views built from
+        # them are what the dataset registry keeps (and evicts) under its memory budget
+        with np.load(os.path.join(self.root, name), allow_pickle=False) as data:
+            return pd.DataFrame({column: data[column] for column in SNAPSHOT_COLUMNS + ["Removed"]})
+
+    def _write_segment(self, name, rows):
+        path = os.path.join(self.root, name)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **{
+                "CollegeName": rows["CollegeName"].to_numpy(dtype=str),
+                "StateInfo": rows["StateInfo"].to_numpy(dtype=str),
+                "Level": rows["Level"].to_numpy(dtype=str),
+                "TotalRegistrations": rows["TotalRegistrations"].to_numpy(dtype="int64"),
+                "Removed": rows["Removed"].to_numpy(dtype=bool),
+            })
+        os.replace(tmp_path, path)
+
+    def as_of(self, snapshot_date):
+        """Registration totals per (college, state, level) as recorded on or before snapshot_date"""
+        entries = [entry for entry in self.manifest() if entry["date"] <= str(snapshot_date)]
+        if not entries:
+            return pd.DataFrame({column: pd.Series(dtype="int64" if column == "TotalRegistrations" else object) for column in SNAPSHOT_COLUMNS})
+
+        # Replay from the most recent full segment; later rows for a key override earlier ones
+        start = max(i for i, entry in enumerate(entries) if entry["kind"] == "full")
+        segments = [self._read_segment(entry["segment"]) for entry in entries[start:]]
+        rows = pd.concat(segments, ignore_index=True) if len(segments) > 1 else segments[0]
+        rows = rows.drop_duplicates(KEY_COLUMNS, keep="last")
+        return rows[~rows["Removed"]][SNAPSHOT_COLUMNS].reset_index(drop=True)
+
+    def ingest(self, snapshot_date, ai_path=sunburst_core.AI_LEADS_PATH, tech_path=sunburst_core.TECH_LEADS_PATH,
+               state_lookup_path=sunburst_core.STATE_LOOKUP_PATH):
+        """Record the current lead files as the snapshot for snapshot_date; returns its manifest entry"""
+        snapshot_date = str(snapshot_date)
+        datetime.date.fromisoformat(snapshot_date)
+        manifest = self.manifest()
+        if manifest and snapshot_date <= manifest[-1]["date"]:
+            raise ValueError(f"Snapshots are append-only: {snapshot_date} is not after {manifest[-1]['date']}")
+
+        current = lead_totals(*sunburst_core.read_lead_files(ai_path, tech_path, state_lookup_path))
+        current["Removed"] = False
+
+        full = len(manifest) % CHECKPOINT_EVERY == 0
+        if full:
+            rows = current
+        else:
+            # Keep only new or changed keys, plus tombstones for keys that are gone
+            previous = self.as_of(manifest[-1]["date"])
+            merged = current.merge(previous, on=KEY_COLUMNS, how="outer", suffixes=("", "_previous"), indicator=True)
+            changed = (merged["_merge"] == "left_only") | (
+                (merged["_merge"] == "both") & (merged["TotalRegistrations"] != merged["TotalRegistrations_previous"]))
+            removed = merged["_merge"] == "right_only"
+            merged.loc[removed, "TotalRegistrations"] = 0
+            merged["Removed"] = removed
+            rows = merged[changed | removed][SNAPSHOT_COLUMNS + ["Removed"]]
+            rows = rows.astype({"TotalRegistrations": "int64", "Removed": bool})
+
+        os.makedirs(self.root, exist_ok=True)
+        entry = {
+            "date": snapshot_date,
+            "segment": f"segment-{snapshot_date}.npz",
+            "kind": "full" if full else "delta",
+            "rows": int(len(current)),
+            "changed": int(len(rows)),
+            "registrations": int(current["TotalRegistrations"].sum()),
+            "state_lookup": lookup_fingerprint(state_lookup_path),
+        }
+        self._write_segment(entry["segment"], rows)
+        with open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        return entry
+
+    def hierarchy_as_of(self, snapshot_date):
+        """Sunburst hierarchy (sunburst_df, ai_df, tech_df) as of snapshot_date"""
+        ai_df, tech_df = lead_frames(self.as_of(snapshot_date))
+        return sunburst_core.build_hierarchy(ai_df, tech_df)
+
+    def delta(self, since, until):
+        """Registration growth per (college, level) between two dates
+
+        Rows are matched on college name and level; StateInfo is the college's state on `until` (or on
+        `since` if it is gone), so a state filled or corrected in between is not a new college.
+        Present is True for rows that exist on `until` (even with 0 registrations); NewCollege is True
+        for colleges that had no rows at all on `since`.
+        """
+        before = college_totals(self.as_of(since))
+        after = college_totals(self.as_of(until))
+        delta = after.merge(before, on=["CollegeName", "Level"], how="outer", suffixes=("", "Before"), indicator=True)
+        delta["Present"] = delta["_merge"] != "right_only"
+        delta["StateInfo"] = delta["StateInfo"].fillna(delta["StateInfoBefore"])
+        delta = delta.rename(columns={"TotalRegistrations": "After"})
+        delta[["After", "TotalRegistrationsBefore"]] = delta[["After", "TotalRegistrationsBefore"]].fillna(0).astype("int64")
+        delta = delta.rename(columns={"TotalRegistrationsBefore": "Before"})
+        delta["Growth"] = delta["After"] - delta["Before"]
+
+        delta["NewCollege"] = ~delta["CollegeName"].isin(before["CollegeName"])
+        return delta[KEY_COLUMNS + ["Before", "After", "Growth", "Present", "NewCollege"]]
+
+    def delta_hierarchy(self, since, until):
+        """Sunburst hierarchy sized by registration growth (declines count as 0) between two dates
+
+        sunburst_df gets an extra NewCollege column marking the nodes of colleges that are new since `since`.
+        """
+        delta = self.delta(since, until)
+        # Only colleges that exist on `until` belong in the hierarchy
+        delta = delta[delta["Present"]]
+        growth = delta[KEY_COLUMNS].assign(TotalRegistrations=delta["Growth"].clip(lower=0))
+        sunburst_df, ai_df, tech_df = sunburst_core.build_hierarchy(*lead_frames(growth))
+
+        new_rows = delta[delta["NewCollege"]]
+        suffixes = new_rows["Level"].map({"Tech Lead": " (Tech Lead)", "AI Intern": " (Intern)"})
+        sunburst_df["NewCollege"] = sunburst_df["Label"].isin(new_rows["CollegeName"] + suffixes)
+        return sunburst_df, ai_df, tech_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append-only registration snapshots")
+    parser.add_argument("--root", default=SNAPSHOT_DIR, help="snapshot store directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="record the lead files as a new snapshot")
+    ingest_parser.add_argument("--date", default=datetime.date.today().isoformat())
+    ingest_parser.add_argument("--ai-leads", default=sunburst_core.AI_LEADS_PATH)
+    ingest_parser.add_argument("--tech-leads", default=sunburst_core.TECH_LEADS_PATH)
+    ingest_parser.add_argument("--state-lookup", default=sunburst_core.STATE_LOOKUP_PATH, help="college -> state master lookup")
+
+    subparsers.add_parser("list", help="list recorded snapshots")
+
+    delta_parser = subparsers.add_parser("delta", help="show registration growth between two snapshots")
+    delta_parser.add_argument("since")
+    delta_parser.add_argument("until")
+    delta_parser.add_argument("--top", type=int, default=20)
+
+    args = parser.parse_args()
+    store = SnapshotStore(args.root)
+
+    if args.command == "ingest":
+        entry = store.ingest(args.date, args.ai_leads, args.tech_leads, args.state_lookup)
+        print(f"Recorded {entry['kind']} snapshot {entry['date']}: {entry['changed']} of {entry['rows']} rows stored")
+    elif args.command == "list":
+        for entry in store.manifest():
+            print(f"{entry['date']}  {entry['kind']:<5}  {entry['changed']:>6} / {entry['rows']:<6} rows  {entry['registrations']} registrations")
+    else:
+        delta = store.delta(args.since, args.until)
+        print(f"New colleges: {delta.loc[delta['NewCollege'], 'CollegeName'].nunique()}")
+        print(f"Registration growth: {int(delta['Growth'].sum())}")
+        print(delta.sort_values("Growth", ascending=False).head(args.top).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Reconciled college -> state master lookup.
+
+Merges any number of partial college -> state mapping files (by default the
+colleges_with_states_generative*.csv resolver outputs) on normalized college names, resolves
+conflicting states by majority vote or by recency, and writes:
+
+    college_state_master.csv     - one row per normalized college name, sorted by CollegeKey
+    college_state_conflicts.csv  - every college whose sources disagreed, with the candidates
+
+Sources are given oldest first; "recency" prefers the last source that has a usable state, and
+"majority" breaks ties the same way. Only Indian states / union territories are usable states, and
+placeholder "college names" (generic words like COLLEGE or STUDENT, numbers, one or two characters)
+are dropped, since the resolvers happily guess a state for those too.
+
+    python state_lookup.py
+    python state_lookup.py --strategy recency colleges_with_states_generative.csv TechLeads.csv
+
+load_and_process_data reads the master file and, with one vectorized join, fills the lead rows whose
+own State is missing or a placeholder ("-") from entries that at least MIN_FILL_VOTES sources agree on. A usable State in the lead files always wins, so
+corrections made in the daily CSVs show up without rebuilding the master.
+"""
+import argparse
+import os
+
+import pandas as pd
+
+STATE_LOOKUP_PATH = "college_state_master.csv"
+CONFLICT_REPORT_PATH = "college_state_conflicts.csv"
+
+# Oldest first. The live lead files are not sources by default: their own State is used directly
+MAPPING_FILES = [
+    "colleges_with_states_generative.csv",
+    "colleges_with_states_generative2.csv",
+    "colleges_with_states_generative3.csv",
+]
+
+STRATEGIES = ("majority", "recency")
+
+# Values that mean "state not known"
+PLACEHOLDER_STATES = {"", "-", "N/A", "NA", "NAN", "NONE", "NULL", "UNKNOWN", "NOT APPLICABLE", "NOT AVAILABLE"}
+
+# The only states a mapping may assign (the resolvers also answer with US states and sentences)
+INDIAN_STATES = [
+    "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar", "Chhattisgarh", "Goa", "Gujarat", "Haryana",
+    "Himachal Pradesh", "Jharkhand", "Karnataka", "Kerala", "Madhya Pradesh", "Maharashtra", "Manipur",
+    "Meghalaya", "Mizoram", "Nagaland", "Odisha", "Punjab", "Rajasthan", "Sikkim", "Tamil Nadu", "Telangana",
+    "Tripura", "Uttar Pradesh", "Uttarakhand", "West Bengal",
+    "Andaman and Nicobar Islands", "Chandigarh", "Dadra and Nagar Haveli and Daman and Diu", "Delhi",
+    "Jammu and Kashmir", "Ladakh", "Lakshadweep", "Puducherry",
+]
+STATE_ALIASES = {"ORISSA": "Odisha", "PONDICHERRY": "Puducherry", "NEW DELHI": "Delhi", "UTTARANCHAL": "Uttarakhand"}
+
+# A single resolver's guess is not trusted to fill a lead row; it takes this many agreeing sources
+MIN_FILL_VOTES = 2
+
+# Words that do not identify a college on their own: a name made only of these is a placeholder
+GENERIC_NAME_WORDS = [
+    "COLLEGE", "UNIVERSITY", "INSTITUTE", "SCHOOL", "OF", "AND", "THE", "ENGINEERING", "TECHNOLOGY", "SCIENCE",
+    "COMPUTER", "DEGREE", "DIPLOMA", "POLYTECHNIC", "B", "TECH", "BTECH", "ECE", "CSE", "IT", "MBA", "MCA",
+    "AUTONOMOUS", "AFFILIATION", "GOVT", "GOVERNMENT", "PRIVATE", "STUDENT", "STUDENTS", "GRADUATE", "FRESHER",
+    "HOUSEWIFE", "UNEMPLOYED", "EMPLOYED", "WORKING", "JOB", "SEARCH", "JUST", "PASSED", "COMPANY", "ORGANIZATION",
+    "OTHER", "OTHERS", "NO", "NOT", "NONE", "NA", "NIL", "ME", "APPLICABLE",
+]
+
+
+def normalize_college_names(names):
+    """Join key for college names: upper case, '&' as AND, punctuation dropped, whitespace collapsed"""
+    return (
+        names.astype("string")
+        .str.upper()
+        .str.replace("&", " AND ", regex=False)
+        .str.replace(r"[^A-Z0-9]+", " ", regex=True)
+        .str.strip()
+        .replace("", pd.NA)
+    )
+
+
+def placeholder_college_keys(keys):
+    """Normalized names that do not identify a college: generic words only, numbers, or 1-2 characters"""
+    generic = keys.str.replace(rf"\b(?:{'|'.join(GENERIC_NAME_WORDS)})\b", "", regex=True).str.strip() == ""
+    return (generic | keys.str.fullmatch(r"[0-9 ]+") | (keys.str.len() <= 2)).fillna(True).astype(bool)
+
+
+def clean_states(states):
+    """Canonical Indian state / union territory names; anything else (placeholders, sentences, US states) is NA"""
+    keys = states.astype("string").str.replace("&", " and ", regex=False).str.replace(r"\s+", " ", regex=True).str.strip().str.upper()
+    canonical = {state.upper(): state for state in INDIAN_STATES} | STATE_ALIASES
+    return keys.map(canonical).astype("string")
+
+
+def read_mapping(path, rank, name_column="CollegeName", state_column="State"):
+    """One source's usable (CollegeKey, State) pairs, tagged with the source and its recency rank"""
+    df = pd.read_csv(path, usecols=[name_column, state_column])
+    keys = normalize_college_names(df[name_column])
+    mapping = pd.DataFrame({
+        "CollegeKey": keys.mask(placeholder_college_keys(keys)),
+        "CollegeName": df[name_column].astype("string").str.strip(),
+        "State": clean_states(df[state_column]),
+    }).dropna(subset=["CollegeKey", "State"])
+    mapping["StateKey"] = mapping["State"].str.upper()
+    mapping["Source"] = os.path.basename(path)
+    mapping["Rank"] = rank
+    return mapping
+
+
+def merge_mappings(paths, strategy="majority"):
+    """Reconcile the mapping files; returns (master, conflicts)"""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}; choose one of {', '.join(STRATEGIES)}")
+
+    mappings = pd.concat([read_mapping(path, rank) for rank, path in enumerate(paths)], ignore_index=True)
+    # Each source gets one vote per (college, state), however often it repeats the row
+    mappings = mappings.drop_duplicates(["CollegeKey", "StateKey", "Source"], keep="last")
+
+    candidates = mappings.groupby(["CollegeKey", "StateKey"], sort=False).agg(
+        Votes=("Source", "size"),
+        Latest=("Rank", "max"),
+        Sources=("Source", ", ".join),
+    ).reset_index()
+
+    order = ["Votes", "Latest"] if strategy == "majority" else ["Latest", "Votes"]
+    candidates = candidates.sort_values(["CollegeKey"] + order, ascending=[True, False, False], kind="stable")
+    candidates["Candidates"] = candidates.groupby("CollegeKey")["StateKey"].transform("size")
+
+    # Display spellings: the most common spelling of each state, the latest spelling of each college
+    state_names = mappings.groupby("StateKey")["State"].agg(lambda spellings: spellings.value_counts().index[0])
+    college_names = mappings.sort_values("Rank").groupby("CollegeKey")["CollegeName"].last()
+    candidates["State"] = candidates["StateKey"].map(state_names)
+    candidates["CollegeName"] = candidates["CollegeKey"].map(college_names)
+
+    master = candidates.drop_duplicates("CollegeKey")[["CollegeKey", "CollegeName", "State", "Votes", "Sources"]]
+    master = master.set_index("CollegeKey").sort_index()
+
+    conflicted = candidates[candidates["Candidates"] > 1]
+    conflicts = conflicted.assign(
+        Candidate=conflicted["State"] + " (" + conflicted["Votes"].astype(str) + ": " + conflicted["Sources"] + ")"
+    ).groupby("CollegeKey", sort=True).agg(
+        CollegeName=("CollegeName", "first"),
+        ChosenState=("State", "first"),
+        Candidates=("Candidate", "; ".join),
+    )
+    return master, conflicts
+
+
+def read_state_lookup(path=STATE_LOOKUP_PATH, min_votes=MIN_FILL_VOTES):
+    """The master lookup's entries with at least min_votes as a Series indexed by CollegeKey, or None if it has not been built"""
+    if not path or not os.path.exists(path):
+        return None
+    master = pd.read_csv(path, usecols=["CollegeKey", "State", "Votes"], dtype={"CollegeKey": "string", "State": "string"},
+                         index_col="CollegeKey")
+    return master.loc[master["Votes"] >= min_votes, "State"]
+
+
+def is_stale(path, source_paths=MAPPING_FILES):
+    """True if the lookup at path exists but is older than one of the mapping files it is built from
+
+    Relative source paths are looked up next to the master; sources that do not exist are ignored.
+    """
+    if not path or not os.path.exists(path):
+        return False
+    built = os.stat(path).st_mtime_ns
+    sources = [os.path.join(os.path.dirname(path), source) for source in source_paths]
+    return any(os.path.exists(source) and os.stat(source).st_mtime_ns > built for source in sources)
+
+
+def resolve_states(df, state_lookup):
+    """Fill missing or placeholder States from the master lookup with one vectorized join
+
+    A usable State already in the file is kept; rows the lookup does not know keep whatever they had.
+    """
+    if state_lookup is None:
+        return df
+    df = df.copy()
+    if "State" not in df.columns:
+        df["State"] = "N/A"
+    # Only placeholders count as missing; any other State in the file is trusted as written
+    states = df["State"].astype("string").str.strip()
+    missing = (states.isna() | states.str.upper().isin(PLACEHOLDER_STATES)).astype(bool)
+    resolved = normalize_college_names(df.loc[missing, "CollegeName"]).map(state_lookup)
+    df.loc[resolved[resolved.notna()].index, "State"] = resolved[resolved.notna()].astype(object)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the reconciled college -> state master lookup")
+    parser.add_argument("sources", nargs="*", default=MAPPING_FILES, help="mapping CSVs with CollegeName and State, oldest first")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="majority")
+    parser.add_argument("--output", default=STATE_LOOKUP_PATH)
+    parser.add_argument("--conflicts", default=CONFLICT_REPORT_PATH)
+    args = parser.parse_args()
+
+    master, conflicts = merge_mappings(args.sources, args.strategy)
+    master.to_csv(args.output)
+    conflicts.to_csv(args.conflicts)
+    print(f"Wrote {len(master)} colleges to {args.output} ({len(conflicts)} conflicts in {args.conflicts})")
+
+
+if __name__ == "__main__":
+    main()
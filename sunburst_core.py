@@ -0,0 +1,313 @@
+import hashlib
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from state_lookup import STATE_LOOKUP_PATH, is_stale, read_state_lookup, resolve_states
+
+# Default lead files - update these paths to match your server file locations
+AI_LEADS_PATH = "aieLeads.csv"
+TECH_LEADS_PATH = "TechLeads.csv"
+
+# Levels that sit above the colleges in the hierarchy
+INTERMEDIATE_LEVELS = ["Program Lead", "Cohort Owner", "AI Coach"]
+COLLEGE_LEVELS = ["Tech Lead", "AI Intern"]
+
+# Colour bands of the top-colleges table, highest first: (minimum registrations, label)
+REGISTRATION_BUCKETS = [(100, "100+"), (50, "50-99"), (0, "<50")]
+
+SUNBURST_COLUMNS = ["Label", "Parent", "TotalRegistrations", "Level", "StateInfo"]
+
+
+def dataset_version(ai_path=AI_LEADS_PATH, tech_path=TECH_LEADS_PATH, state_lookup_path=STATE_LOOKUP_PATH):
+    """Return a short fingerprint of the lead files (and state lookup) that changes whenever one is rewritten"""
+    fingerprint = hashlib.sha1()
+    for path in (ai_path, tech_path):
+        stat = os.stat(path)
+        fingerprint.update(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    # The state lookup is optional; building or removing it changes the fingerprint too
+    if state_lookup_path and os.path.exists(state_lookup_path):
+        stat = os.stat(state_lookup_path)
+        fingerprint.update(f"{os.path.abspath(state_lookup_path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return fingerprint.hexdigest()[:16]
+
+
+def read_lead_files(ai_path=AI_LEADS_PATH, tech_path=TECH_LEADS_PATH, state_lookup_path=STATE_LOOKUP_PATH):
+    """Read both lead files with missing States filled from the college -> state master lookup when it exists"""
+    if is_stale(state_lookup_path):
+        warnings.warn(f"{state_lookup_path} is older than its mapping files; rebuild it with `python state_lookup.py`")
+    state_lookup = read_state_lookup(state_lookup_path)
+    return resolve_states(pd.read_csv(ai_path), state_lookup), resolve_states(pd.read_csv(tech_path), state_lookup)
+
+
+def load_and_process_data(ai_path=AI_LEADS_PATH, tech_path=TECH_LEADS_PATH, state_lookup_path=STATE_LOOKUP_PATH):
+    """Load both lead files and build the sunburst hierarchy; returns (sunburst_df, ai_df, tech_df)"""
+    return build_hierarchy(*read_lead_files(ai_path, tech_path, state_lookup_path))
+
+
+def build_hierarchy(ai_df, tech_df):
+    """Build the sunburst hierarchy from lead frames with CollegeName, TotalRegistrations and (optionally) State"""
+    ai_df = ai_df.copy()
+    tech_df = tech_df.copy()
+
+    # Tag each level
+    ai_df["Level"] = "AI Intern"
+    tech_df["Level"] = "Tech Lead"
+
+    # Prepare labels without trailing spaces for consistency
+    tech_df["Label"] = tech_df["CollegeName"] + " (Tech Lead)"
+    ai_df["Label"] = ai_df["CollegeName"] + " (Intern)"
+
+    # Store State information for hover - handle missing State column gracefully
+    if "State" in tech_df.columns:
+        tech_df["StateInfo"] = tech_df["State"]
+    else:
+        tech_df["StateInfo"] = "N/A"
+
+    if "State" in ai_df.columns:
+        ai_df["StateInfo"] = ai_df["State"]
+    else:
+        ai_df["StateInfo"] = "N/A"
+
+    # Assign Parent for tech leads (children of AI Coach 1)
+    tech_df["Parent"] = "AI Coach 1"
+
+    # Map AI Intern's Parent to Tech Lead's Label exactly
+    ai_df["Parent"] = ai_df["CollegeName"].map(dict(zip(tech_df["CollegeName"], tech_df["Label"])))
+
+    # Handle unmatched AI Interns by assigning them to a default "Tech Lead (Unassigned)"
+    ai_df["Parent"] = ai_df["Parent"].fillna("Tech Lead (Unassigned)")
+
+    # Create intermediate nodes with default TotalRegistrations
+    coaches = pd.DataFrame({
+        "Label": ["AI Coach 1"],
+        "Parent": ["Cohort Owner 1"],
+        "TotalRegistrations": [200],  # default value
+        "Level": ["AI Coach"],
+        "StateInfo": ["N/A"]  # No state for intermediate nodes
+    })
+
+    cohorts = pd.DataFrame({
+        "Label": ["Cohort Owner 1"],
+        "Parent": ["Program Lead"],
+        "TotalRegistrations": [20],  # default value
+        "Level": ["Cohort Owner"],
+        "StateInfo": ["N/A"]  # No state for intermediate nodes
+    })
+
+    program = pd.DataFrame({
+        "Label": ["Program Lead"],
+        "Parent": [""],
+        "TotalRegistrations": [1],  # default value
+        "Level": ["Program Lead"],
+        "StateInfo": ["N/A"]  # No state for intermediate nodes
+    })
+
+    # Add missing "Tech Lead (Unassigned)" node
+    unassigned = pd.DataFrame({
+        "Label": ["Tech Lead (Unassigned)"],
+        "Parent": ["AI Coach 1"],
+        "TotalRegistrations": [0],
+        "Level": ["Tech Lead"],
+        "StateInfo": ["N/A"]  # No state for unassigned
+    })
+
+    # Combine all dataframes
+    sunburst_df = pd.concat([
+        program[SUNBURST_COLUMNS],
+        cohorts[SUNBURST_COLUMNS],
+        coaches[SUNBURST_COLUMNS],
+        tech_df[SUNBURST_COLUMNS],
+        ai_df[SUNBURST_COLUMNS],
+        unassigned[SUNBURST_COLUMNS],
+    ], ignore_index=True)
+
+    # Ensure TotalRegistrations is numeric
+    sunburst_df["TotalRegistrations"] = pd.to_numeric(sunburst_df["TotalRegistrations"], errors="coerce").fillna(0)
+
+    return sunburst_df, ai_df, tech_df
+
+
+def get_available_states(sunburst_df):
+    """Sorted list of states present in the data (excluding N/A and intermediate nodes)"""
+    return sorted(sunburst_df[
+        (sunburst_df["StateInfo"] != "N/A") &
+        (sunburst_df["StateInfo"].notna())
+    ]["StateInfo"].unique())
+
+
+def _college_totals(ai_df, tech_df):
+    """Registrations summed per (college, state) across both lead files"""
+    # Combine data from both dataframes so registrations can be summed by college
+    colleges_df = pd.concat([
+        tech_df[["CollegeName", "TotalRegistrations", "StateInfo"]],
+        ai_df[["CollegeName", "TotalRegistrations", "StateInfo"]],
+    ], ignore_index=True)
+
+    # Group by college name and sum registrations
+    return colleges_df.groupby(["CollegeName", "StateInfo"])["TotalRegistrations"].sum().reset_index()
+
+
+def get_top_colleges_by_registrations(ai_df, tech_df, selected_state=None, min_registrations=100):
+    """Get colleges with registrations >= min_registrations, optionally filtered by state"""
+    college_totals = _college_totals(ai_df, tech_df)
+
+    # Filter by state if specified
+    if selected_state and selected_state != "All States":
+        college_totals = college_totals[college_totals["StateInfo"] == selected_state]
+
+    # Filter colleges with registrations >= minimum threshold
+    filtered_colleges = college_totals[college_totals["TotalRegistrations"] >= min_registrations]
+
+    # Sort by total registrations (descending)
+    top_colleges = filtered_colleges.sort_values("TotalRegistrations", ascending=False, kind="stable")
+
+    return top_colleges
+
+
+def filter_data_by_state(sunburst_df, selected_state):
+    """Filter the sunburst data for a specific state"""
+    if selected_state == "All States":
+        return sunburst_df
+
+    # If no data for the selected state, return empty dataframe with structure
+    if not (sunburst_df["StateInfo"] == selected_state).any():
+        return pd.DataFrame(columns=sunburst_df.columns)
+
+    # Filter to include only relevant Tech Leads and AI Interns
+    # Keep intermediate nodes and only the colleges from selected state
+    filtered_df = sunburst_df[
+        (sunburst_df["Level"].isin(INTERMEDIATE_LEVELS)) |  # Keep all intermediate nodes
+        (sunburst_df["StateInfo"] == selected_state) |  # Keep state-specific nodes
+        ((sunburst_df["Level"] == "Tech Lead") & (sunburst_df["StateInfo"] == "N/A") & (sunburst_df["Label"] == "Tech Lead (Unassigned)"))  # Keep unassigned if needed
+    ].copy()
+
+    # Remove unassigned tech lead if no AI interns are unassigned in this state
+    unassigned_interns = sunburst_df[
+        (sunburst_df["Level"] == "AI Intern") &
+        (sunburst_df["Parent"] == "Tech Lead (Unassigned)") &
+        (sunburst_df["StateInfo"] == selected_state)
+    ]
+
+    if len(unassigned_interns) == 0:
+        filtered_df = filtered_df[filtered_df["Label"] != "Tech Lead (Unassigned)"]
+
+    return filtered_df
+
+
+def _strip_level_suffix(labels):
+    """Recover the college name from a Tech Lead / AI Intern label"""
+    return labels.str.replace(r" \((Tech Lead|Intern)\)$", "", regex=True)
+
+
+def build_rollup_cube(sunburst_df, ai_df, tech_df):
+    """Materialize the state x level rollups once per data load so the widgets can read them in O(1)
+
+    Returns a dict of plain lookups:
+        cells          - (state, level) -> colleges / registrations / nodes
+        levels         - state -> levels that have a cell for that state
+        states         - state -> colleges / total_registrations / tech_leads / ai_interns
+        colleges       - (state, college) -> total_registrations / tech_leads / ai_interns
+        level_totals   - state -> "Total Registrations by Level" table of the state's hierarchy
+        college_totals - state -> (colleges sorted by registrations, negated registrations for searchsorted)
+        buckets        - state -> number of colleges per REGISTRATION_BUCKETS label
+    Every per-state lookup also has an "All States" entry.
+    """
+    rows = sunburst_df.copy()
+    rows["StateInfo"] = rows["StateInfo"].fillna("N/A")
+    # Same college key the "Colleges in State" metric has always counted
+    rows["CollegeKey"] = rows["Label"].str.replace(r" \(.*\)", "", regex=True)
+    rows["CollegeName"] = _strip_level_suffix(rows["Label"])
+    rows["IsTechLead"] = rows["Level"] == "Tech Lead"
+    rows["IsAIIntern"] = rows["Level"] == "AI Intern"
+    all_rows = rows.assign(StateInfo="All States")
+    both = pd.concat([rows, all_rows], ignore_index=True)
+
+    # (state, level) cells
+    cells_df = both.groupby(["StateInfo", "Level"]).agg(
+        colleges=("CollegeKey", lambda keys: keys.nunique(dropna=False)),
+        registrations=("TotalRegistrations", "sum"),
+        nodes=("Label", "size"),
+    )
+    cells = {key: {name: int(value) for name, value in values.items()} for key, values in cells_df.to_dict("index").items()}
+    levels = {}
+    for state, level in cells:
+        levels.setdefault(state, []).append(level)
+
+    # Per-state tiles
+    college_rows = both[both["Level"].isin(COLLEGE_LEVELS)]
+    states_df = both.groupby("StateInfo").agg(
+        total_registrations=("TotalRegistrations", "sum"),
+        tech_leads=("IsTechLead", "sum"),
+        ai_interns=("IsAIIntern", "sum"),
+    ).join(college_rows.groupby("StateInfo")["CollegeKey"].nunique(dropna=False).rename("colleges")).fillna(0)
+    states = {state: {name: int(value) for name, value in values.items()} for state, values in states_df.to_dict("index").items()}
+
+    # Per-college tiles (the "Tech Lead (Unassigned)" placeholder is not a college)
+    named_rows = college_rows[college_rows["Label"] != "Tech Lead (Unassigned)"]
+    colleges_df = named_rows.groupby(["StateInfo", "CollegeName"]).agg(
+        total_registrations=("TotalRegistrations", "sum"),
+        tech_leads=("IsTechLead", "sum"),
+        ai_interns=("IsAIIntern", "sum"),
+    )
+    colleges = {key: {name: int(value) for name, value in values.items()} for key, values in colleges_df.to_dict("index").items()}
+
+    # Expander summary - totals by level over each state's filtered hierarchy (see filter_data_by_state):
+    # all intermediate nodes, the state's own nodes, and the unassigned Tech Lead if it has interns there
+    intermediate = rows[rows["Level"].isin(INTERMEDIATE_LEVELS)].groupby("Level")["TotalRegistrations"].sum()
+    unassigned = rows[rows["Label"] == "Tech Lead (Unassigned)"]["TotalRegistrations"].sum()
+    unassigned_states = set(rows[rows["IsAIIntern"] & (rows["Parent"] == "Tech Lead (Unassigned)")]["StateInfo"])
+    level_totals = {"All States": both[both["StateInfo"] == "All States"].groupby("Level")["TotalRegistrations"].sum().reset_index()}
+    for state in get_available_states(sunburst_df):
+        by_level = intermediate.to_dict()
+        for level in COLLEGE_LEVELS:
+            if (state, level) in cells:
+                by_level[level] = cells[(state, level)]["registrations"]
+        if state in unassigned_states:
+            by_level["Tech Lead"] = by_level.get("Tech Lead", 0) + unassigned
+        level_totals[state] = pd.DataFrame(
+            sorted(by_level.items()), columns=["Level", "TotalRegistrations"])
+
+    # Top-colleges lists and registration buckets
+    totals = _college_totals(ai_df, tech_df)
+    college_totals = {}
+    buckets = {}
+    for state, state_totals in [("All States", totals)] + list(totals.groupby("StateInfo")):
+        ordered = state_totals.sort_values("TotalRegistrations", ascending=False, kind="stable")
+        college_totals[state] = (ordered, -ordered["TotalRegistrations"].to_numpy())
+        bucket_labels = pd.cut(
+            state_totals["TotalRegistrations"],
+            bins=[-float("inf")] + [low for low, _ in reversed(REGISTRATION_BUCKETS[:-1])] + [float("inf")],
+            right=False,
+            labels=[label for _, label in reversed(REGISTRATION_BUCKETS)],
+        )
+        counts = bucket_labels.value_counts()
+        buckets[state] = {label: int(counts.get(label, 0)) for _, label in REGISTRATION_BUCKETS}
+
+    return {
+        "cells": cells,
+        "levels": levels,
+        "states": states,
+        "colleges": colleges,
+        "level_totals": level_totals,
+        "college_totals": college_totals,
+        "buckets": buckets,
+    }
+
+
+def top_colleges_from_cube(cube, selected_state=None, min_registrations=100):
+    """Cube-backed equivalent of get_top_colleges_by_registrations"""
+    state = selected_state if selected_state and selected_state != "All States" else "All States"
+    if state not in cube["college_totals"]:
+        return pd.DataFrame(columns=["CollegeName", "StateInfo", "TotalRegistrations"])
+    ordered, negated = cube["college_totals"][state]
+    return ordered.iloc[:int(np.searchsorted(negated, -min_registrations, side="right"))]
+
+
+def state_summary(cube, selected_state="All States"):
+    """Summary metrics for one state, read from the rollup cube"""
+    tiles = cube["states"].get(selected_state, {"colleges": 0, "total_registrations": 0, "tech_leads": 0, "ai_interns": 0})
+    by_level = {level: cube["cells"][(selected_state, level)]["registrations"] for level in cube["levels"].get(selected_state, [])}
+    return dict(tiles, state=selected_state, registrations_by_level=by_level)